@@ -28,6 +28,7 @@ class CleanAPIDocsDemo:
         self.detection_query_id = None
         self.details_query_id = None
         self._cleanup_done = False
+        self._done_event = asyncio.Event()  # set when details have been extracted
         
 
     async def on_docs_detected(self, result):
@@ -66,7 +67,8 @@ class CleanAPIDocsDemo:
                 print("=" * 50)
                 print("✅ Demo completed successfully!")
                 
-                await self.shutdown()
+                # main() shuts down once it sees this; doing it here would cancel this callback's own task
+                self._done_event.set()
             else:
                 print(f"❌ Confidence too low ({confidence:.3f}) for details extraction")
                 
@@ -171,7 +173,12 @@ async def main():
         # Step 7: Run demo
         print("\n⏳ Demo running for 60 seconds...")
         print("   Open any API documentation in your browser to see it in action!")
-        await asyncio.sleep(60)
+        async with asyncio.TaskGroup() as tg:
+            # Whichever finishes first - the time limit or a completed demo - cancels the other
+            timer = tg.create_task(asyncio.sleep(60))
+            done = tg.create_task(demo._done_event.wait())
+            timer.add_done_callback(lambda _: done.cancel())
+            done.add_done_callback(lambda _: timer.cancel())
         
     except KeyboardInterrupt:
         print("\n🛑 Demo interrupted by user")
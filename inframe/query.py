@@ -18,6 +18,31 @@ class QueryConfig:
     interval_seconds: float
     recorder_internal_id: Optional[str] = None  # Store the internal recorder ID for tracking
 
+class _LLMContextView:
+    """Context integrator proxy that serves the recorder's bounded LLM view to queriers
+    
+    The view is built from segments that only change at the tail, so prompts keep a
+    byte-identical prefix across ticks and hit provider-side prompt caching. Whenever
+    the recorder has not yet seen the integrator's current context, or that context is
+    not a string, the integrator's value is passed through unchanged.
+    """
+    
+    def __init__(self, recorder):
+        self._recorder = recorder
+        self._integrator = recorder.context_integrator
+    
+    def __getattr__(self, name):
+        return getattr(self._integrator, name)
+    
+    async def get_current_context(self):
+        """Get the recorder's LLM view of the integrator's context, or the context itself if the view is behind"""
+        context = await self._integrator.get_current_context()
+        if isinstance(context, str):
+            view = self._recorder.build_llm_view(context)
+            if view is not None:
+                return view
+        return context
+
 class ContextQuery:
     """Unified query system that monitors recorders and runs prompts on context updates"""
     
@@ -133,7 +158,7 @@ class ContextQuery:
             context_querier.set_result_callback(self._create_result_handler(config))
         
         # Start monitoring the recorder
-        await context_querier.start_querier(config.recorder.context_integrator, config.prompt)
+        await context_querier.start_querier(_LLMContextView(config.recorder), config.prompt)
         
         # Store the querier
         self.context_queriers[query_id] = context_querier
@@ -1,24 +1,94 @@
 import asyncio
+import fcntl
+import hashlib
+import logging
+import os
+import sys
+import threading
 from pathlib import Path
 from datetime import datetime
-from typing import List, Optional, Dict, Any, Literal
+from typing import List, Optional, Dict, Any, FrozenSet, Literal, Tuple
 import tempfile
 from dataclasses import dataclass
 import uuid
 
+import orjson
+
 from src.video_stream import VideoStream
 from src.transcription_pipeline import create_transcription_pipeline, TranscriptionPipeline
 from src.context_integrator import create_context_integrator
 
 RecordingMode = Literal["full_screen", "window_only"]
 
+log = logging.getLogger(__name__)
+
+# Context updates are appended to a delta log and compacted into the cache file periodically
+SNAPSHOT_EVERY_UPDATES = 20
+
+# LLM view of the context keeps the header segment plus the most recent segments verbatim;
+# older ones are evicted in steps so the prompt prefix stays stable between steps
+LLM_VIEW_RECENT_SEGMENTS = 30
+LLM_VIEW_EVICTION_STEP = 10
+
+class _RecordingSlotPool:
+    """Pool of reusable per-recorder clip directories under the recordings dir
+    
+    Slots are claimed with an exclusive lock on a per-slot lock file under
+    root/.locks, outside the slot itself so nothing writing into the slot can
+    remove it. The OS drops the lock when the owning process exits, so
+    restarted agents reuse the same few directories instead of accumulating
+    one per recorder.
+    """
+    
+    def __init__(self, root: Path):
+        self.root = root
+        self.lock_dir = root / ".locks"
+        self._held: Dict[Path, Any] = {}  # slot dir -> open lock file
+    
+    def acquire(self) -> Path:
+        """Claim the lowest free slot and clear clips left behind by a previous owner"""
+        index = 0
+        while True:
+            slot = self.root / f"slot_{index:04d}"
+            if slot not in self._held:
+                self.lock_dir.mkdir(parents=True, exist_ok=True)
+                lock_fh = (self.lock_dir / f"{slot.name}.lock").open("a")
+                try:
+                    fcntl.flock(lock_fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    lock_fh.close()
+                else:
+                    slot.mkdir(exist_ok=True)
+                    self._clear(slot)
+                    self._held[slot] = lock_fh
+                    return slot
+            index += 1
+    
+    def release(self, slot: Path):
+        """Clear a slot's clips and return it to the pool"""
+        lock_fh = self._held.pop(slot, None)
+        if lock_fh is None:
+            return
+        try:
+            self._clear(slot)
+        finally:
+            lock_fh.close()
+    
+    def _clear(self, slot: Path):
+        if not slot.is_dir():
+            return  # removed by whoever was writing into it
+        for entry in slot.iterdir():
+            if entry.is_file():
+                entry.unlink(missing_ok=True)
+
 @dataclass
 class RecorderConfig:
-    include_apps: Optional[List[str]] = None
+    include_apps: FrozenSet[str] = frozenset()  # casefolded app names; empty means all apps
     recording_mode: RecordingMode = "full_screen"
     visual_task: Optional[str] = None
     video_stream: Optional[VideoStream] = None
     transcription_pipeline: Optional[TranscriptionPipeline] = None
+    recordings_slot: Optional[Path] = None
     is_recording: bool = False
 
 class ContextRecorder:
@@ -31,9 +101,22 @@ class ContextRecorder:
         # Ensure cache directory exists
         self.cache_file.parent.mkdir(parents=True, exist_ok=True)
         
+        # Delta log next to the cache file; readers apply it on top of the last snapshot
+        self.context_log_file = self.cache_file.with_name(self.cache_file.name + ".jsonl")
+        self._log_fh = None  # opened on the first export, closed on shutdown
+        self._exported_context: Optional[str] = None
+        self._updates_since_snapshot = 0
+        
+        # Latest context seen from the integrator, whether or not it was written out
+        self._latest_context: Optional[str] = None
+        
+        # Latest context as immutable (segment_id, text) pieces, so LLM prompts keep a byte-stable prefix
+        self._context_segments: List[Tuple[str, str]] = []
+        
         # Set up temporary recordings directory
         self.recordings_dir = Path(tempfile.gettempdir()) / 'screenctx_recordings'
         self.recordings_dir.mkdir(exist_ok=True)
+        self._recording_slots = _RecordingSlotPool(self.recordings_dir)
         
         self.recorders = {}
         self.active_recorders = 0
@@ -47,6 +130,11 @@ class ContextRecorder:
         
         # Context export callback
         self.context_integrator.set_callback(self._on_context_update)
+        
+        # Persistent event loop thread backing the legacy sync methods (created on first use)
+        self._bg_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._bg_thread: Optional[threading.Thread] = None
+        self._bg_loop_lock = threading.Lock()
     
     def __hash__(self):
         """Make ContextRecorder hashable using its unique ID"""
@@ -82,31 +170,136 @@ class ContextRecorder:
             # Ensure we have a string
             if isinstance(current_context, dict):
                 # If it's a dict, convert to JSON string
-                import json
-                current_context = json.dumps(current_context, indent=2)
+                current_context = orjson.dumps(
+                    current_context, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+                ).decode()
             elif not isinstance(current_context, str):
                 # Convert to string if it's not already
                 current_context = str(current_context)
             
-            # Write to cache file for compatibility with existing ContextQuery
-            self.cache_file.write_text(current_context)
+            self._update_segments(current_context)
             
-        except Exception as e:
-            print(f"Error updating context cache: {e}")
-            import traceback
-            traceback.print_exc()
+            # Export to cache file for compatibility with existing ContextQuery
+            self._export_context(current_context)
+            
+        except Exception:
+            log.exception("context cache update failed")
+    
+    def _update_segments(self, text: str):
+        """Keep the segments that still prefix text and add the remainder as a new segment"""
+        previous = self._latest_context
+        if text == previous:
+            return
+        if previous is not None and text.startswith(previous):
+            offset = len(previous)
+        else:
+            offset = 0
+            kept = 0
+            for _, segment_text in self._context_segments:
+                if not text.startswith(segment_text, offset):
+                    break
+                offset += len(segment_text)
+                kept += 1
+            del self._context_segments[kept:]
+        
+        if offset < len(text):
+            remainder = text[offset:]
+            segment_id = hashlib.blake2b(remainder.encode(), digest_size=8).hexdigest()
+            self._context_segments.append((segment_id, remainder))
+        self._latest_context = text
+    
+    def build_llm_view(self, context: str) -> Optional[str]:
+        """Get a bounded view of context for LLM prompts, or None if the segments do not reflect it yet
+        
+        The first (header) segment is always kept. Segments older than the most
+        recent LLM_VIEW_RECENT_SEGMENTS are replaced by a single eviction marker.
+        A retained segment that repeats an earlier retained one is sent as a short
+        back-reference when that is shorter, so text already sent never changes.
+        """
+        if not self._context_segments or context != self._latest_context:
+            return None
+        
+        header, body = self._context_segments[0], self._context_segments[1:]
+        evicted = max(0, len(body) - LLM_VIEW_RECENT_SEGMENTS)
+        evicted -= evicted % LLM_VIEW_EVICTION_STEP
+        retained = body[evicted:]
+        
+        parts = [header[1]]
+        if evicted:
+            parts.append(f"[{evicted} earlier context updates evicted]\n")
+        
+        seen = set()
+        for segment_id, segment_text in retained:
+            marker = f"[repeat of update {segment_id}]\n"
+            if segment_text in seen and len(marker) < len(segment_text):
+                parts.append(marker)
+            else:
+                seen.add(segment_text)
+                parts.append(segment_text)
+        return "".join(parts)
+    
+    def _export_context(self, text: str):
+        """Append the change since the last export to the delta log, compacting periodically"""
+        previous = self._exported_context
+        if text == previous:
+            return
+        # A rewritten context would need a full copy in the log anyway, so snapshot instead
+        if (previous is None or not text.startswith(previous)
+                or self._updates_since_snapshot >= SNAPSHOT_EVERY_UPDATES):
+            self._write_snapshot(text)
+            return
+        
+        # Context only grew - log the appended suffix
+        record = {"base": len(previous), "text": text[len(previous):]}
+        self._context_log().write(orjson.dumps(record) + b"\n")
+        self._exported_context = text
+        self._updates_since_snapshot += 1
+    
+    def _write_snapshot(self, text: str):
+        """Atomically replace the cache file with the full context and reset the delta log"""
+        tmp = self.cache_file.with_name(self.cache_file.name + ".tmp")
+        tmp.write_text(text, encoding="utf-8")
+        # Truncate before the rename so a reader never applies old deltas to the new snapshot
+        self._context_log().truncate(0)
+        os.replace(tmp, self.cache_file)
+        self._exported_context = text
+        self._updates_since_snapshot = 0
+    
+    def _context_log(self):
+        """Get the delta log handle, opening it on first use"""
+        if self._log_fh is None:
+            self._log_fh = self.context_log_file.open("ab", buffering=0)
+        return self._log_fh
+    
+    def _close_context_log(self):
+        """Close the delta log handle if it is open"""
+        if self._log_fh is not None:
+            self._log_fh.close()
+            self._log_fh = None
+    
+    def _compact_context_log(self):
+        """Fold the delta log into the cache file so it holds the latest context on its own"""
+        if self._latest_context is None:
+            return
+        if self._updates_since_snapshot or self._latest_context != self._exported_context:
+            self._write_snapshot(self._latest_context)
     
     def add_recorder(self, buffer_duration: int = 30, include_apps: Optional[List[str]] = [],
                  recording_mode: RecordingMode = "full_screen", chunk_duration: float = 5.0, max_clips: int = 20, video_priority: int = 0, context_priority: int = 0, visual_task: Optional[str] = None):
 
-        recorder_id = str(uuid.uuid4())
-        video_stream = VideoStream.create(
-            chunk_duration=chunk_duration,
-            max_clips=max_clips,
-            temp_dir=str(self.recordings_dir / recorder_id),
-            buffer_duration=buffer_duration,
-            priority=video_priority
-        )
+        recorder_id = sys.intern(uuid.uuid4().hex)
+        recordings_slot = self._recording_slots.acquire()
+        try:
+            video_stream = VideoStream.create(
+                chunk_duration=chunk_duration,
+                max_clips=max_clips,
+                temp_dir=str(recordings_slot),
+                buffer_duration=buffer_duration,
+                priority=video_priority
+            )
+        except BaseException:
+            self._recording_slots.release(recordings_slot)
+            raise
         
         transcription_pipeline = create_transcription_pipeline(
             openai_api_key=self.openai_api_key,
@@ -115,11 +308,12 @@ class ContextRecorder:
         )
 
         config = RecorderConfig(
-            include_apps=include_apps,
+            include_apps=frozenset(app.casefold() for app in (include_apps or [])),
             recording_mode=recording_mode,
             visual_task=visual_task,
             video_stream=video_stream,
-            transcription_pipeline=transcription_pipeline
+            transcription_pipeline=transcription_pipeline,
+            recordings_slot=recordings_slot
         )
 
         self.recorders[recorder_id] = config
@@ -205,6 +399,7 @@ class ContextRecorder:
             self.active_recorders -= 1
             if self.active_recorders == 0:
                 self.is_recording = False
+                self._compact_context_log()
             print("✅ Context recording stopped")
             
             return True
@@ -218,18 +413,29 @@ class ContextRecorder:
         try:
             print("🔄 Shutting down ContextRecorder...")
             
-            # Stop all active recordings
-            active_recorder_ids = list(self.recorders.keys())
+            # Stop all active recordings concurrently
+            active_recorder_ids = [rid for rid, config in self.recorders.items() if config.is_recording]
             for recorder_id in active_recorder_ids:
-                if self.recorders[recorder_id].is_recording:
-                    print(f"Stopping recorder {recorder_id[:8]}...")
-                    try:
-                        await self.stop(recorder_id)
-                    except Exception as e:
-                        print(f"❌ Error stopping recorder {recorder_id[:8]}: {e}")
+                print(f"Stopping recorder {recorder_id[:8]}...")
+            results = await asyncio.gather(
+                *(self.stop(recorder_id) for recorder_id in active_recorder_ids),
+                return_exceptions=True
+            )
+            for recorder_id, result in zip(active_recorder_ids, results):
+                if isinstance(result, BaseException):
+                    print(f"❌ Error stopping recorder {recorder_id[:8]}: {result}")
             
             # Stop the shared context integrator
             await self.context_integrator.stop_integrator()
+            self._compact_context_log()
+            self._close_context_log()
+            if not self._on_bg_loop():
+                self._stop_bg_loop()  # shutdown_sync() stops it once this returns
+            
+            # Return clip directories to the pool
+            for config in self.recorders.values():
+                if config.recordings_slot is not None:
+                    self._recording_slots.release(config.recordings_slot)
             
             # Clear all state
             self.recorders.clear()
@@ -309,18 +515,70 @@ class ContextRecorder:
             return f"Error exporting session: {e}"
     
     def get_cache_file_path(self) -> Path:
-        """Get the path to the cache file for compatibility"""
+        """Get the path to the cache file for compatibility
+        
+        The file holds the last snapshot only; updates since then are appended to
+        a delta log next to it (see read_context() in local-inframe/context_cache.py).
+        """
         return self.cache_file
     
     
+    @staticmethod
+    def _run_bg_loop(loop: asyncio.AbstractEventLoop):
+        """Thread target for the background loop; closes the loop once it is stopped"""
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+    
+    def _on_bg_loop(self) -> bool:
+        """Check whether the caller is running on the background loop thread"""
+        return self._bg_thread is not None and threading.current_thread() is self._bg_thread
+    
+    def _run_sync(self, coro):
+        """Run a coroutine on the persistent background loop and wait for its result"""
+        with self._bg_loop_lock:
+            if self._on_bg_loop():
+                coro.close()
+                raise RuntimeError("Legacy sync methods cannot be called from the recorder's own event loop; await the async method instead")
+            if self._bg_loop is None:
+                self._bg_loop = asyncio.new_event_loop()
+                self._bg_thread = threading.Thread(
+                    target=self._run_bg_loop, args=(self._bg_loop,), name="inframe-recorder-loop", daemon=True
+                )
+                self._bg_thread.start()
+            loop = self._bg_loop
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+    
+    def _stop_bg_loop(self, wait: bool = False):
+        """Stop the background loop thread, if one was started, and let it close the loop
+        
+        Only waits for the thread to exit when wait is set, so async callers never block their loop.
+        """
+        with self._bg_loop_lock:
+            loop, thread = self._bg_loop, self._bg_thread
+            self._bg_loop = self._bg_thread = None
+        if loop is None:
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        if wait:
+            thread.join()
+    
     def start_sync(self, recorder_id: str) -> bool:
         """Legacy sync method to start recording"""
-        return asyncio.run(self.start(recorder_id))
+        return self._run_sync(self.start(recorder_id))
     
     def stop_sync(self, recorder_id: str) -> None:
         """Legacy sync method to stop recording"""
-        asyncio.run(self.stop(recorder_id))
+        self._run_sync(self.stop(recorder_id))
     
     def get_status_sync(self, recorder_id: str) -> Dict[str, Any]:
         """Legacy sync method to get status"""
-        return asyncio.run(self.get_status(recorder_id))
\ No newline at end of file
+        return self._run_sync(self.get_status(recorder_id))
+    
+    def shutdown_sync(self) -> bool:
+        """Legacy sync method to shut down, then stop the background loop"""
+        try:
+            return self._run_sync(self.shutdown())
+        finally:
+            self._stop_bg_loop(wait=True)
\ No newline at end of file
@@ -77,6 +77,9 @@ class Querier:
         self.query_url = os.environ.get("QUERY_URL", "https://adscope--query-service.modal.run")
         self.endpoint_url = self.query_url.replace(".modal.run", "-query-v1.modal.run")
         
+        # Shared HTTP client so concurrent questions reuse pooled connections
+        self._client: Optional[httpx.AsyncClient] = None
+        
         # Statistics tracking
         self.query_stats = QueryStats(
             session_id=self.session_id or "all_sessions",
@@ -100,6 +103,22 @@ class Querier:
         """Get the session ID for this querier"""
         return self.session_id
     
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the shared HTTP client, creating it on first use"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=600.0,
+                verify=False,  # Disable SSL verification for testing
+                http2=False,   # Disable HTTP/2 to avoid compatibility issues
+                follow_redirects=True,  # Follow HTTP redirects (like 303)
+                limits=httpx.Limits(
+                    max_connections=32,
+                    max_keepalive_connections=32,
+                    keepalive_expiry=60.0
+                )
+            )
+        return self._client
+    
     async def ask_question(self, 
                           question: str,
                           top_k: int = 20,
@@ -132,100 +151,94 @@ class Querier:
                 "min_similarity": min_similarity
             }
             
-            # Make HTTP POST request to Modal API
-            async with httpx.AsyncClient(
-                timeout=600.0,
-                verify=False,  # Disable SSL verification for testing
-                http2=False,   # Disable HTTP/2 to avoid compatibility issues
-                follow_redirects=True  # Follow HTTP redirects (like 303)
-            ) as client:
-                response = await client.post(
-                    self.endpoint_url,
-                    json=payload
-                )
+            # Make HTTP POST request to Modal API over the shared connection pool
+            response = await self._get_client().post(
+                self.endpoint_url,
+                json=payload
+            )
+            
+            print(f"📡 HTTP Response: {response.status_code}")
+            print(f"📡 Response headers: {dict(response.headers)}")
+            print(f"📡 Response text preview: {response.text[:200]}...")
+            
+            if response.status_code == 200:
+                try:
+                    api_result = response.json()
+                    print(f"📡 JSON parsing successful, keys: {list(api_result.keys()) if isinstance(api_result, dict) else 'Not a dict'}")
+                except Exception as json_error:
+                    print(f"❌ JSON parsing failed: {json_error}")
+                    print(f"❌ Full response text: {response.text}")
+                    raise json_error
                 
-                print(f"📡 HTTP Response: {response.status_code}")
-                print(f"📡 Response headers: {dict(response.headers)}")
-                print(f"📡 Response text preview: {response.text[:200]}...")
+                # Update statistics
+                self.query_stats.total_queries += 1
+                self.query_stats.total_search_operations += 1
+                self.query_stats.total_analysis_operations += 1
                 
-                if response.status_code == 200:
-                    try:
-                        api_result = response.json()
-                        print(f"📡 JSON parsing successful, keys: {list(api_result.keys()) if isinstance(api_result, dict) else 'Not a dict'}")
-                    except Exception as json_error:
-                        print(f"❌ JSON parsing failed: {json_error}")
-                        print(f"❌ Full response text: {response.text}")
-                        raise json_error
+                if api_result.get("success", False):
+                    # Success case
+                    self.query_stats.successful_queries += 1
+                    
+                    # Update average confidence
+                    confidence = api_result.get("confidence", 0.0)
+                    total_confidence = (self.query_stats.average_confidence * 
+                                     (self.query_stats.successful_queries - 1) + 
+                                     confidence)
+                    self.query_stats.average_confidence = total_confidence / self.query_stats.successful_queries
+                    
+                    result = QueryResult(
+                        session_id=self.session_id or "all_sessions",
+                        question=question,
+                        answer=api_result.get("answer", ""),
+                        confidence=confidence,
+                        video_id=api_result.get("video_id", ""),
+                        frame_count=api_result.get("frame_count", 0),
+                        analysis_success=True
+                    )
                     
-                    # Update statistics
-                    self.query_stats.total_queries += 1
-                    self.query_stats.total_search_operations += 1
-                    self.query_stats.total_analysis_operations += 1
+                    print(f"✅ Analysis completed successfully!")
+                    print(f"   Confidence: {confidence:.3f}")
+                    print(f"   Frames analyzed: {api_result.get('frame_count', 0)}")
                     
-                    if api_result.get("success", False):
-                        # Success case
-                        self.query_stats.successful_queries += 1
-                        
-                        # Update average confidence
-                        confidence = api_result.get("confidence", 0.0)
-                        total_confidence = (self.query_stats.average_confidence * 
-                                         (self.query_stats.successful_queries - 1) + 
-                                         confidence)
-                        self.query_stats.average_confidence = total_confidence / self.query_stats.successful_queries
-                        
-                        result = QueryResult(
-                            session_id=self.session_id or "all_sessions",
-                            question=question,
-                            answer=api_result.get("answer", ""),
-                            confidence=confidence,
-                            video_id=api_result.get("video_id", ""),
-                            frame_count=api_result.get("frame_count", 0),
-                            analysis_success=True
-                        )
-                        
-                        print(f"✅ Analysis completed successfully!")
-                        print(f"   Confidence: {confidence:.3f}")
-                        print(f"   Frames analyzed: {api_result.get('frame_count', 0)}")
-                        
-                        return result
-                    else:
-                        # API returned failure
-                        self.query_stats.failed_queries += 1
-                        
-                        result = QueryResult(
-                            session_id=self.session_id or "all_sessions",
-                            question=question,
-                            answer=api_result.get("answer", "No relevant content found to answer this question."),
-                            confidence=0.0,
-                            video_id="",
-                            frame_count=0,
-                            analysis_success=False,
-                            error_message=api_result.get("error", "API returned failure")
-                        )
-                        
-                        print(f"❌ API returned failure: {api_result.get('error', 'Unknown error')}")
-                        return result
+                    return result
                 else:
-                    # HTTP error
+                    # API returned failure
                     self.query_stats.failed_queries += 1
-                    self.query_stats.total_queries += 1
-                    
-                    error_msg = f"HTTP error {response.status_code}: {response.text}"
-                    print(f"❌ {error_msg}")
                     
                     result = QueryResult(
                         session_id=self.session_id or "all_sessions",
                         question=question,
-                        answer="Unable to analyze the video content due to an HTTP error.",
+                        answer=api_result.get("answer", "No relevant content found to answer this question."),
                         confidence=0.0,
                         video_id="",
                         frame_count=0,
                         analysis_success=False,
-                        error_message=error_msg
+                        error_message=api_result.get("error", "API returned failure")
                     )
                     
+                    print(f"❌ API returned failure: {api_result.get('error', 'Unknown error')}")
                     return result
+            else:
+                # HTTP error
+                self.query_stats.failed_queries += 1
+                self.query_stats.total_queries += 1
+                
+                error_msg = f"HTTP error {response.status_code}: {response.text}"
+                print(f"❌ {error_msg}")
                 
+                result = QueryResult(
+                    session_id=self.session_id or "all_sessions",
+                    question=question,
+                    answer="Unable to analyze the video content due to an HTTP error.",
+                    confidence=0.0,
+                    video_id="",
+                    frame_count=0,
+                    analysis_success=False,
+                    error_message=error_msg
+                )
+                
+                return result
+            
         except Exception as e:
             # Error case
             self.query_stats.failed_queries += 1
@@ -279,9 +292,10 @@ class Querier:
         print(f"🤖 Asking {len(questions)} questions concurrently{session_info}...")
         print("=" * 50)
         
-        # Create tasks for all questions to run concurrently
+        # Create one task per distinct question; repeated questions share the same answer
+        unique_questions = list(dict.fromkeys(questions))
         tasks = []
-        for question in questions:
+        for question in unique_questions:
             task = self.ask_question(
                 question=question,
                 top_k=top_k,
@@ -292,8 +306,9 @@ class Querier:
             tasks.append(task)
         
         # Execute all questions concurrently
-        print(f"🚀 Launching {len(questions)} concurrent API requests...")
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        print(f"🚀 Launching {len(unique_questions)} concurrent API requests...")
+        unique_results = dict(zip(unique_questions, await asyncio.gather(*tasks, return_exceptions=True)))
+        results = [unique_results[question] for question in questions]
         
         # Process results and handle any exceptions
         processed_results = []
@@ -361,7 +376,10 @@ class Querier:
         session_info = f" for session: {self.session_id}" if self.session_id else ""
         print(f"🧹 Cleaning up querier{session_info}...")
         
-        # No cleanup needed for API-based querier
+        # Close the shared HTTP client and its pooled connections
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
         print("✅ Querier cleanup completed")
 
 
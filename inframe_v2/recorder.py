@@ -6,9 +6,11 @@ Provides a simple start/stop interface for recording with automatic clip process
 
 import asyncio
 import base64
+import hashlib
 import os
 import tempfile
 import uuid
+import cv2
 import httpx
 from typing import Optional, Dict, Any
 from dataclasses import dataclass
@@ -25,6 +27,7 @@ class RecordingStats:
     total_processing_failures: int
     recording_duration: float
     is_running: bool
+    total_clips_deduplicated: int = 0
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization"""
@@ -33,24 +36,72 @@ class RecordingStats:
             'total_clips_recorded': self.total_clips_recorded,
             'total_clips_processed': self.total_clips_processed,
             'total_processing_failures': self.total_processing_failures,
+            'total_clips_deduplicated': self.total_clips_deduplicated,
             'recording_duration': self.recording_duration,
             'is_running': self.is_running
         }
 
 
+# Frames sampled per clip by the processing service
+PROCESS_NUM_FRAMES = 4
+
+def _clip_signature(file_path: str,
+                    num_frames: int = PROCESS_NUM_FRAMES,
+                    width: int = 256,
+                    levels: int = 32) -> Optional[bytes]:
+    """Compute a content signature over the frames the processing service samples
+    
+    Each sampled frame is downscaled to `width` pixels wide and quantized, which
+    absorbs compression noise while still registering typed text or a changed URL.
+    
+    Args:
+        file_path: Path to the video clip
+        num_frames: Number of evenly spaced frames to include
+        width: Width the frames are downscaled to before hashing
+        levels: Number of grey levels kept after quantization
+        
+    Returns:
+        Signature bytes, or None if the clip's frames could not be read
+    """
+    capture = cv2.VideoCapture(file_path)
+    try:
+        frame_count = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+        if frame_count <= 0:
+            return None
+        
+        signature = hashlib.blake2b(digest_size=16)
+        for i in range(num_frames):
+            capture.set(cv2.CAP_PROP_POS_FRAMES, i * frame_count // num_frames)
+            ok, frame = capture.read()
+            if not ok or frame is None:
+                return None
+            
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            height = max(1, gray.shape[0] * width // gray.shape[1])
+            small = cv2.resize(gray, (width, height), interpolation=cv2.INTER_AREA)
+            signature.update((small // (256 // levels)).tobytes())
+        return signature.digest()
+    finally:
+        capture.release()
+
+
 class Recorder:
     """Video recorder that sends clips to Modal API for processing"""
     
     def __init__(self, 
                  session_id: Optional[str] = None,
                  temp_dir: Optional[str] = None,
-                 max_clips: int = 50):
+                 max_clips: int = 50,
+                 skip_unchanged_clips: bool = False):
         """Initialize the recorder
         
         Args:
             session_id: Unique session identifier (auto-generated if None)
             temp_dir: Directory for temporary video files (default: system temp)
             max_clips: Maximum number of clips to keep in memory
+            skip_unchanged_clips: Don't upload a clip whose sampled frames match the
+                previously processed clip. Saves processing on static screens, but the
+                skipped time range and its audio are never sent to the service.
         """
         # Generate session ID if not provided
         self.session_id = session_id or str(uuid.uuid4())
@@ -66,6 +117,10 @@ class Recorder:
             max_clips=max_clips
         )
         
+        # Signature of the last successfully processed clip, to skip unchanged follow-ups
+        self.skip_unchanged_clips = skip_unchanged_clips
+        self._last_clip_signature: Optional[bytes] = None
+        
         # State tracking
         self.is_recording = False
         self.start_time: Optional[float] = None
@@ -103,6 +158,19 @@ class Recorder:
             processing_url = os.environ.get("PROCESSING_URL", "https://adscope--processing-service.modal.run")
             endpoint_url = processing_url.replace(".modal.run", "-process-v1.modal.run")
             
+            # Skip a clip whose sampled frames match the clip processed just before it
+            clip_signature = None
+            if self.skip_unchanged_clips:
+                clip_signature = await asyncio.to_thread(_clip_signature, clip.file_path)
+            if clip_signature is not None and clip_signature == self._last_clip_signature:
+                self.recording_stats.total_clips_recorded += 1
+                self.recording_stats.total_clips_deduplicated += 1
+                print(f"♻️ Skipped unchanged clip: {os.path.basename(clip.file_path)}")
+                return
+            
+            # Only a successfully processed clip may serve as the comparison point
+            self._last_clip_signature = None
+            
             print(f"📡 Making HTTP request to: {endpoint_url}")
             print(f"📡 Session ID: {self.session_id}")
             
@@ -132,7 +200,7 @@ class Recorder:
                     endpoint_url,
                     params={
                         "session_id": self.session_id,
-                        "num_frames": 4
+                        "num_frames": PROCESS_NUM_FRAMES
                     },
                     json={"clip_json": clip_json}
                 )
@@ -149,6 +217,7 @@ class Recorder:
                         result_data = result.get("result", {})
                         frames_embedded = result_data.get("successful_frame_count", 0)
                         self.recording_stats.total_clips_processed += 1
+                        self._last_clip_signature = clip_signature
                         print(f"✅ Processed clip: {os.path.basename(clip.file_path)} ({frames_embedded} frames embedded)")
                     else:
                         self.recording_stats.total_processing_failures += 1
@@ -255,13 +324,16 @@ class Recorder:
 # Factory function for easy creation
 def create_recorder(session_id: Optional[str] = None,
                    temp_dir: Optional[str] = None,
-                   max_clips: int = 50) -> Recorder:
+                   max_clips: int = 50,
+                   skip_unchanged_clips: bool = False) -> Recorder:
     """Create a recorder for video recording with automatic clip processing via Modal API
     
     Args:
         session_id: Unique session identifier (auto-generated if None)
         temp_dir: Directory for temporary video files
         max_clips: Maximum number of clips to keep in memory
+        skip_unchanged_clips: Skip uploading clips unchanged from the previous one
+            (their time range and audio are not processed)
         
     Returns:
         Recorder instance
@@ -269,5 +341,6 @@ def create_recorder(session_id: Optional[str] = None,
     return Recorder(
         session_id=session_id,
         temp_dir=temp_dir,
-        max_clips=max_clips
+        max_clips=max_clips,
+        skip_unchanged_clips=skip_unchanged_clips
     ) 
\ No newline at end of file
@@ -0,0 +1,90 @@
+"""
+Context Cache Reader - Reads the context a ContextRecorder exports to its cache file
+
+Standard library only, so the MCP servers and scripts next to it can read the
+cache without importing the inframe package or its recording dependencies.
+"""
+
+import json
+import mmap
+import os
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Union
+
+def context_log_path(cache_file: Union[str, Path]) -> Path:
+    """Get the delta log path that ContextRecorder keeps next to a cache file"""
+    cache_file = Path(cache_file)
+    return cache_file.with_name(cache_file.name + ".jsonl")
+
+def _read_snapshot(cache_file: Path) -> str:
+    """Decode the snapshot straight from a read-only mapping, skipping the intermediate bytes copy"""
+    with cache_file.open("rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                return str(view, "utf-8")
+
+def read_context(cache_file: Union[str, Path]) -> str:
+    """Read the latest context a ContextRecorder exported to cache_file
+
+    The recorder writes periodic snapshots to cache_file and appends the
+    updates in between to a delta log; this applies the log on top of the
+    snapshot. Raises FileNotFoundError if no snapshot exists yet.
+    """
+    cache_file = Path(cache_file)
+    content = _read_snapshot(cache_file)
+    context_log_file = context_log_path(cache_file)
+    if not context_log_file.exists():
+        return content
+
+    for line in context_log_file.read_bytes().splitlines():
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            break  # Partially written trailing record
+        if record.get("base") == len(content):
+            content += record["text"]
+    return content
+
+@lru_cache(maxsize=2)
+def cache_path_for(day: date) -> Path:
+    """Daily cache file path the MCP servers read, looked up per call so a long-running server rolls over at midnight"""
+    return Path.home() / f'.cache/inframe/{day.strftime("%d%m%Y")}'
+
+# Memoized context, invalidated when the snapshot or delta log changes on disk
+_ctx_cache = {"key": None, "text": "", "recent_session": None}
+
+def _file_signature(path: Path):
+    """Identify the current version of a file by mtime and size"""
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+def _find_last_line(content: str, prefix: str) -> Optional[str]:
+    """Find the last line starting with prefix, scanning backwards from the end"""
+    end = len(content)
+    while True:
+        start = content.rfind(prefix, 0, end)
+        if start == -1:
+            return None
+        if start == 0 or content[start - 1] == '\n':
+            line_end = content.find('\n', start)
+            return content[start:line_end if line_end != -1 else len(content)]
+        end = start + len(prefix) - 1
+
+def load_context(cache_file: Path):
+    """Return (content, most recent session line), re-reading only when the files changed"""
+    key = (cache_file, _file_signature(cache_file), _file_signature(context_log_path(cache_file)))
+    if key == _ctx_cache["key"]:
+        return _ctx_cache["text"], _ctx_cache["recent_session"]
+    
+    content = read_context(cache_file)
+    recent_session = _find_last_line(content, 'NEW RECORDING SESSION')
+    
+    _ctx_cache.update(key=key, text=content, recent_session=recent_session)
+    return content, recent_session
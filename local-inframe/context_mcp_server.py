@@ -7,20 +7,19 @@ AI assistants through Cursor's MCP integration.
 """
 
 import asyncio
-from datetime import datetime
-from pathlib import Path
+from datetime import date
 from mcp.server.fastmcp import FastMCP
+from context_cache import cache_path_for, load_context
 
 mcp = FastMCP("screen-context")
-ddmmyyyy = datetime.now().strftime('%d%m%Y')
-cache_file = Path.home() / f'.cache/inframe/{ddmmyyyy}'
 
 @mcp.tool()
 async def get_latest_screen_context() -> str:
     """Get the latest screen recording context and transcription"""
     
+    cache_file = cache_path_for(date.today())
     if cache_file.exists():
-        content = cache_file.read_text()
+        content, _ = load_context(cache_file)
         return content
     else:
         return "No screen context available. Run 'python local_context_recorder.py' to record some context."
@@ -29,14 +28,9 @@ async def get_latest_screen_context() -> str:
 async def check_screen_context_status() -> str:
     """Check if screen context is available and show basic info"""
     
+    cache_file = cache_path_for(date.today())
     if cache_file.exists():
-        content = cache_file.read_text()
-        lines = content.split('\n')
-        # Find the most recent session
-        recent_session = None
-        for line in lines:
-            if line.startswith('NEW RECORDING SESSION'):
-                recent_session = line
+        content, recent_session = load_context(cache_file)
         
         if recent_session:
             return f"Screen context is available. {recent_session}\nTotal content length: {len(content)} characters"
@@ -12,6 +12,7 @@ import asyncio
 from datetime import datetime
 from pathlib import Path
 from inframe import ContextRecorder
+from context_cache import read_context
 
 async def main_async(args):
     recorder = ContextRecorder(cache_file=args.cache_file)
@@ -50,7 +51,7 @@ async def main_async(args):
         print("\n--- Cached Context ---\n")
         try:
             if cache_file.exists():
-                print(cache_file.read_text())
+                print(read_context(cache_file))
             else:
                 print("⚠️ Cache file not found - no context was generated during recording")
         except Exception as e: